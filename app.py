@@ -1,63 +1,172 @@
-from flask import Flask, render_template, request, jsonify
-from src.main import run_hedge_fund
+import asyncio
+import hashlib
 import json
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
+
+import orjson
+import uvicorn
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from pydantic import BaseModel
+
+from src.main import run_hedge_fund
+from src.tools.api import get_company_news_many, get_financial_metrics_many, get_market_caps, get_prices_batch
 
-app = Flask(__name__)
+app = FastAPI()
+templates = Jinja2Templates(directory="templates")
 
-# List of available analysts
+# Completed analyses keyed by a hash of the normalized request, reused for 10 minutes
+_results_cache: TTLCache = TTLCache(maxsize=128, ttl=600)
+
+# List of available analysts, with the Yahoo Finance data each one reads (warmed before a run)
 ANALYSTS = [
-    {"id": "warren_buffett", "name": "Warren Buffett", "description": "Value investing with emphasis on quality and safety"},
-    {"id": "cathie_wood", "name": "Cathie Wood", "description": "Disruptive technology and innovation"},
-    {"id": "michael_burry", "name": "Michael Burry", "description": "Deep value and contrarian investing"},
-    {"id": "peter_lynch", "name": "Peter Lynch", "description": "Growth at a reasonable price (GARP)"},
-    {"id": "technical", "name": "Technical Analysis", "description": "Price action and technical indicators"},
-    {"id": "fundamental", "name": "Fundamental Analysis", "description": "Traditional financial metrics"},
-    {"id": "sentiment", "name": "Sentiment Analysis", "description": "Market sentiment and news"},
-    {"id": "valuation", "name": "Valuation", "description": "Intrinsic value calculation"}
+    {"id": "warren_buffett", "name": "Warren Buffett", "description": "Value investing with emphasis on quality and safety", "data": {"metrics", "market_cap"}},
+    {"id": "cathie_wood", "name": "Cathie Wood", "description": "Disruptive technology and innovation", "data": {"metrics", "market_cap"}},
+    {"id": "michael_burry", "name": "Michael Burry", "description": "Deep value and contrarian investing", "data": {"metrics", "market_cap", "news"}},
+    {"id": "peter_lynch", "name": "Peter Lynch", "description": "Growth at a reasonable price (GARP)", "data": {"metrics", "market_cap", "news"}},
+    {"id": "technical", "name": "Technical Analysis", "description": "Price action and technical indicators", "data": set()},
+    {"id": "fundamental", "name": "Fundamental Analysis", "description": "Traditional financial metrics", "data": {"metrics"}},
+    {"id": "sentiment", "name": "Sentiment Analysis", "description": "Market sentiment and news", "data": {"news"}},
+    {"id": "valuation", "name": "Valuation", "description": "Intrinsic value calculation", "data": {"metrics", "market_cap"}}
 ]
+ANALYST_DATA = {analyst["id"]: analyst["data"] for analyst in ANALYSTS}
+
+
+def _cache_key(tickers: list[str], start_date: str, end_date: str, selected_analysts: list[str], initial_cash: float, model_name: str, model_provider: str) -> str:
+    """Hash the inputs that determine an analysis so identical requests share a key."""
+    payload = {
+        "t": sorted(tickers),
+        "s": start_date,
+        "e": end_date,
+        "a": sorted(selected_analysts),
+        "c": initial_cash,
+        "m": model_name,
+        "p": model_provider,
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _default_window(day: int) -> tuple[str, str]:
+    """Default (start_date, end_date) for the 90 days up to a day ordinal, computed once per day."""
+    end = date.fromordinal(day)
+    return (end - timedelta(days=90)).isoformat(), end.isoformat()
+
+
+async def _warm_cache(tickers: list[str], start_date: str, end_date: str, selected_analysts: list[str]):
+    """Prefetch the data the selected analysts read, off the event loop and in parallel.
+
+    This is best-effort: a failed prefetch is ignored and the agent that needs the data fetches
+    (and reports) it itself.
+    """
+    needed = set().union(*(ANALYST_DATA.get(analyst, set()) for analyst in selected_analysts))
+
+    def warm_info():
+        # Metrics and market caps both read the shared ticker info, so fetch them one after the
+        # other: the second is then served from the info cache instead of refetching it
+        if "metrics" in needed:
+            get_financial_metrics_many(tickers, end_date)
+        if "market_cap" in needed:
+            get_market_caps(tickers, end_date)
+
+    # Prices are always needed by the risk manager
+    fetches = [asyncio.to_thread(get_prices_batch, tickers, start_date, end_date)]
+    if needed & {"metrics", "market_cap"}:
+        fetches.append(asyncio.to_thread(warm_info))
+    if "news" in needed:
+        # Without a start date, so the cached range also covers agents that read news with one
+        fetches.append(asyncio.to_thread(get_company_news_many, tickers, end_date, start_date=None))
+    await asyncio.gather(*fetches, return_exceptions=True)
+
 
-@app.route('/')
-def index():
-    return render_template('index.html', analysts=ANALYSTS)
+def _sse(event: str, payload: dict) -> str:
+    """Format a payload as a Server-Sent Event, serialized with orjson."""
+    data = orjson.dumps(payload, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+    return f"event: {event}\ndata: {data.decode()}\n\n"
+
+
+class AnalyzeRequest(BaseModel):
+    tickers: str
+    analysts: list[str]
+    start_date: str | None = None
+    end_date: str | None = None
+    initial_cash: float = 100000.0
+    model_name: str = "gpt-4"
+    model_provider: str = "OpenAI"
+
+
+@app.get("/")
+async def index(request: Request):
+    return templates.TemplateResponse("index.html", {"request": request, "analysts": ANALYSTS})
+
+
+@app.post("/analyze")
+async def analyze(body: AnalyzeRequest):
+    # Yahoo Finance symbols are upper-case, and the caches are keyed by the symbol as given
+    tickers = [ticker for ticker in (t.strip().upper() for t in body.tickers.split(',')) if ticker]
+    if not tickers:
+        raise HTTPException(status_code=400, detail="At least one ticker is required")
+    selected_analysts = body.analysts
 
-@app.route('/analyze', methods=['POST'])
-def analyze():
-    data = request.json
-    tickers = [ticker.strip() for ticker in data['tickers'].split(',')]
-    selected_analysts = data['analysts']
-    
     # Set default dates if not provided
-    end_date = data.get('end_date', datetime.now().strftime('%Y-%m-%d'))
-    start_date = data.get('start_date', (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'))
-    
+    start_date, end_date = body.start_date, body.end_date
+    if not (start_date and end_date):
+        default_start, default_end = _default_window(date.today().toordinal())
+        start_date = start_date or default_start
+        end_date = end_date or default_end
+
+    key = _cache_key(tickers, start_date, end_date, selected_analysts, body.initial_cash, body.model_name, body.model_provider)
+
     # Initial portfolio setup
     portfolio = {
         "positions": {},
-        "total_cash": float(data.get('initial_cash', 100000.0))
+        "total_cash": body.initial_cash
     }
-    
-    try:
-        result = run_hedge_fund(
-            tickers=tickers,
-            start_date=start_date,
-            end_date=end_date,
-            portfolio=portfolio,
-            show_reasoning=True,
-            selected_analysts=selected_analysts,
-            model_name=data.get('model_name', 'gpt-4'),
-            model_provider=data.get('model_provider', 'OpenAI')
-        )
-        
-        return jsonify({
-            'success': True,
-            'data': result
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        })
+
+    async def event_generator():
+        if (cached_result := _results_cache.get(key)) is not None:
+            yield _sse("complete", {'success': True, 'data': cached_result})
+            return
+
+        loop = asyncio.get_running_loop()
+        agent_outputs: asyncio.Queue = asyncio.Queue()
+
+        def on_agent_complete(agent_name, output):
+            # Called from the worker thread running the fund, so hand off to the event loop
+            loop.call_soon_threadsafe(agent_outputs.put_nowait, {'agent': agent_name, 'output': output})
+
+        try:
+            await _warm_cache(tickers, start_date, end_date, selected_analysts)
+
+            run_task = asyncio.ensure_future(asyncio.to_thread(
+                run_hedge_fund,
+                tickers=tickers,
+                start_date=start_date,
+                end_date=end_date,
+                portfolio=portfolio,
+                show_reasoning=True,
+                selected_analysts=selected_analysts,
+                model_name=body.model_name,
+                model_provider=body.model_provider,
+                on_agent_complete=on_agent_complete
+            ))
+            # None marks the end of the run, queued after every agent output
+            run_task.add_done_callback(lambda _: agent_outputs.put_nowait(None))
+
+            # Send each agent's output as soon as it finishes
+            while (partial := await agent_outputs.get()) is not None:
+                yield _sse("agent", partial)
+
+            result = run_task.result()
+            _results_cache[key] = result
+            yield _sse("complete", {'success': True, 'data': result})
+        except Exception as e:
+            yield _sse("error", {'success': False, 'error': str(e)})
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=8080) 
\ No newline at end of file
+    uvicorn.run("app:app", host='0.0.0.0', port=8080, workers=4)
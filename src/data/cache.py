@@ -1,71 +1,285 @@
-class Cache:
-    """In-memory cache for API responses."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+import pandas as pd
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
+# Ticker info (quote summary) changes intraday, so it is only reused for a short window
+INFO_TTL_SECONDS = 300
 
-        # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+# Persisted fundamentals are refetched once they are older than a day
+FUNDAMENTALS_TTL_SECONDS = 24 * 60 * 60
 
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
-        return merged
+# Yahoo Finance keeps publishing articles, so a fetched news range is only reused for an hour
+NEWS_TTL_SECONDS = 60 * 60
+
+# A price range that ends today or later can still change, so it is only reused for a short window
+LIVE_PRICES_TTL_SECONDS = 300
+
+# Number of price DataFrames kept in memory, each keyed by (ticker, start_date, end_date)
+PRICE_FRAME_CACHE_SIZE = 256
+
+# Location of the on-disk cache, relative to the working directory unless absolute
+CACHE_DB_PATH = os.getenv("HEDGE_FUND_CACHE_PATH", ".cache/hedge_fund.db")
+
+# Bumped whenever the tables change; an on-disk cache with another version is dropped and rebuilt
+SCHEMA_VERSION = 2
+
+
+class _PriceFrameCache:
+    """Small in-memory LRU of price DataFrames, so repeated lookups skip rebuilding them from rows."""
+
+    def __init__(self, maxsize: int = PRICE_FRAME_CACHE_SIZE):
+        self._frames: OrderedDict[tuple[str, str, str], pd.DataFrame] = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, str]) -> pd.DataFrame | None:
+        with self._lock:
+            if (df := self._frames.get(key)) is None:
+                return None
+            self._frames.move_to_end(key)
+        # Return a copy so callers can't modify the cached frame
+        return df.copy()
+
+    def set(self, key: tuple[str, str, str], df: pd.DataFrame):
+        # Store a copy so the caller can keep using (and modifying) the frame it passed in
+        df = df.copy()
+        with self._lock:
+            self._frames[key] = df
+            self._frames.move_to_end(key)
+            if len(self._frames) > self._maxsize:
+                self._frames.popitem(last=False)
+
+
+class SqliteCache:
+    """SQLite-backed cache for API responses that persists across runs.
+
+    Prices live in their own table keyed by (ticker, time) so date ranges are served by an index
+    range scan. Everything else is stored as JSON blobs with the time it was written (as_of).
+    Date-ranged reads (prices, news) are only served when the coverage table records that the whole
+    range was fetched recently enough; otherwise they miss and the caller refetches.
+    """
+
+    def __init__(self, path: str = CACHE_DB_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._price_frames = _PriceFrameCache()
+        # One connection shared across threads, serialized by a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # It's only a cache, so rebuild it rather than migrate it
+                for table in ("prices", "records", "coverage"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS prices (
+                    ticker TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume INTEGER,
+                    PRIMARY KEY (ticker, time)
+                )
+                """
+            )
+            # id tells apart records that share a key, e.g. two articles published on the same date
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS records (
+                    kind TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    as_of REAL NOT NULL,
+                    PRIMARY KEY (kind, ticker, key, id)
+                )
+                """
+            )
+            # Date ranges that were fetched in full; an empty start means "from the beginning"
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS coverage (
+                    kind TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL,
+                    as_of REAL NOT NULL,
+                    PRIMARY KEY (kind, ticker, start, end)
+                )
+                """
+            )
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _set_coverage(self, kind: str, rows: list[tuple[str, str | None, str]], as_of: float):
+        """Record (ticker, start, end) ranges as fetched, dropping older ranges they contain.
+
+        Must be called with the lock held, inside the transaction that writes the data.
+        """
+        rows = [(kind, ticker, start or "", end) for ticker, start, end in rows]
+        self._conn.executemany("DELETE FROM coverage WHERE kind = ? AND ticker = ? AND start >= ? AND end <= ?", rows)
+        self._conn.executemany("INSERT INTO coverage (kind, ticker, start, end, as_of) VALUES (?, ?, ?, ?, ?)", [row + (as_of,) for row in rows])
+
+    def _is_covered(self, kind: str, ticker: str, start: str | None, end: str, ttl: float, settled_after_end: bool = False) -> bool:
+        """Whether [start, end] lies within a single fetched range that is younger than ttl.
+
+        With settled_after_end, a range fetched after its end date has passed (in UTC) never expires,
+        since its data can no longer change.
+        """
+        sql = "SELECT 1 FROM coverage WHERE kind = ? AND ticker = ? AND start <= ? AND end >= ? AND (as_of >= ?"
+        if settled_after_end:
+            sql += " OR date(as_of, 'unixepoch') > end"
+        return bool(self._query(sql + ") LIMIT 1", (kind, ticker, start or "", end, time.time() - ttl)))
+
+    def _get_records(self, kind: str, ticker: str, start: str | None = None, end: str | None = None, ttl: float | None = None) -> list[dict[str, any]] | None:
+        """Get stored JSON records of a kind, optionally limited to a key range and to entries younger than ttl."""
+        sql = "SELECT data FROM records WHERE kind = ? AND ticker = ?"
+        params = [kind, ticker]
+        if start is not None:
+            sql += " AND key >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND key <= ?"
+            params.append(end)
+        if ttl is not None:
+            sql += " AND as_of >= ?"
+            params.append(time.time() - ttl)
+        rows = self._query(sql + " ORDER BY key, id", tuple(params))
+        return [json.loads(data) for (data,) in rows] or None
+
+    def _set_records(self, kind: str, ticker: str, data: list[dict[str, any]], key_field: str, unique_key: bool = True, coverage: tuple[str | None, str] | None = None):
+        """Insert or refresh JSON records of a kind in a single transaction.
+
+        Records with a unique key replace the stored record for that key. Otherwise each distinct
+        record is kept, identified by a hash of its contents. If coverage is given as (start, end),
+        that range is recorded as fetched in the same transaction.
+        """
+        as_of = time.time()
+        rows = []
+        for item in data:
+            blob = json.dumps(item, default=str, sort_keys=True)
+            record_id = "" if unique_key else hashlib.sha1(blob.encode()).hexdigest()
+            rows.append((kind, ticker, item[key_field], record_id, blob, as_of))
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO records (kind, ticker, key, id, data, as_of) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            if coverage is not None:
+                self._set_coverage(kind, [(ticker, *coverage)], as_of)
 
     def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+        return self._select_prices("SELECT open, close, high, low, volume, time FROM prices WHERE ticker = ? ORDER BY time", (ticker,))
+
+    def set_prices(self, ticker: str, data: list[dict[str, any]], start_date: str, end_date: str):
+        """Insert or replace price data fetched for [start_date, end_date] in a single transaction."""
+        self.set_prices_many({ticker: data}, start_date, end_date)
+
+    def set_prices_many(self, data: dict[str, list[dict[str, any]]], start_date: str, end_date: str):
+        """Insert or replace price data for several tickers, all fetched for [start_date, end_date], in a single transaction."""
+        rows = [(ticker, p["time"], p["open"], p["high"], p["low"], p["close"], p["volume"]) for ticker, prices in data.items() for p in prices]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO prices (ticker, time, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._set_coverage("prices", [(ticker, start_date, end_date) for ticker in data], time.time())
+
+    def get_prices_in_range(self, ticker: str, start_date: str, end_date: str) -> list[dict[str, any]] | None:
+        """Get cached price data between start_date and end_date (inclusive), oldest first.
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+        Returns None unless the whole range was fetched, and (for a range that had not ended when it
+        was fetched) fetched within LIVE_PRICES_TTL_SECONDS.
+        """
+        if not self._is_covered("prices", ticker, start_date, end_date, ttl=LIVE_PRICES_TTL_SECONDS, settled_after_end=True):
+            return None
+        return self._select_prices("SELECT open, close, high, low, volume, time FROM prices WHERE ticker = ? AND time BETWEEN ? AND ? ORDER BY time", (ticker, start_date, end_date)) or []
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+    def get_price_frame(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame | None:
+        """Get a cached price DataFrame for exactly this date range if available.
+
+        Frames are rebuilt from the prices table, so they are only kept in memory, and are only
+        served while get_prices_in_range would also hit for the range.
+        """
+        if not self._is_covered("prices", ticker, start_date, end_date, ttl=LIVE_PRICES_TTL_SECONDS, settled_after_end=True):
+            return None
+        return self._price_frames.get((ticker, start_date, end_date))
+
+    def set_price_frame(self, ticker: str, start_date: str, end_date: str, df: pd.DataFrame):
+        """Cache a price DataFrame for this date range."""
+        self._price_frames.set((ticker, start_date, end_date), df)
+
+    def _select_prices(self, sql: str, params: tuple) -> list[dict[str, any]] | None:
+        rows = self._query(sql, params)
+        return [{"open": o, "close": c, "high": h, "low": l, "volume": v, "time": t} for o, c, h, l, v, t in rows] or None
+
+    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]] | None:
+        """Get cached financial metrics if available and not expired."""
+        return self._get_records("financial_metrics", ticker, ttl=FUNDAMENTALS_TTL_SECONDS)
 
     def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        """Store financial metrics in the cache."""
+        self._set_records("financial_metrics", ticker, data, key_field="report_period")
 
     def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+        """Get cached line items if available and not expired."""
+        return self._get_records("line_items", ticker, ttl=FUNDAMENTALS_TTL_SECONDS)
 
     def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+        """Store line items in the cache."""
+        self._set_records("line_items", ticker, data, key_field="report_period")
 
     def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._get_records("insider_trades", ticker)
 
     def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
-        """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        """Store insider trades in the cache. Several trades can share a filing date."""
+        self._set_records("insider_trades", ticker, data, key_field="filing_date", unique_key=False)
 
     def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        """Get cached company news if available and not expired."""
+        return self._get_records("company_news", ticker, ttl=NEWS_TTL_SECONDS)
+
+    def set_company_news(self, ticker: str, data: list[dict[str, any]], start_date: str | None, end_date: str):
+        """Store company news fetched for [start_date, end_date] in the cache. Several articles can share a date."""
+        self._set_records("company_news", ticker, data, key_field="date", unique_key=False, coverage=(start_date, end_date))
+
+    def get_company_news_in_range(self, ticker: str, start_date: str | None, end_date: str) -> list[dict[str, any]] | None:
+        """Get cached company news between start_date and end_date (inclusive), oldest first.
+
+        Returns None unless the whole range was fetched within NEWS_TTL_SECONDS.
+        """
+        if not self._is_covered("company_news", ticker, start_date, end_date, ttl=NEWS_TTL_SECONDS):
+            return None
+        return self._get_records("company_news", ticker, start=start_date, end=end_date) or []
+
+    def get_info(self, ticker: str) -> dict[str, any] | None:
+        """Get cached ticker info if it is younger than INFO_TTL_SECONDS."""
+        if records := self._get_records("info", ticker, ttl=INFO_TTL_SECONDS):
+            return records[0]
+        return None
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
-        """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+    def set_info(self, ticker: str, data: dict[str, any]):
+        """Replace cached ticker info and record when it was fetched."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO records (kind, ticker, key, id, data, as_of) VALUES ('info', ?, '', '', ?, ?)", (ticker, json.dumps(data, default=str), time.time()))
 
 
 # Global cache instance
-_cache = Cache()
+_cache = SqliteCache()
 
 
-def get_cache() -> Cache:
+def get_cache() -> SqliteCache:
     """Get the global cache instance."""
     return _cache
@@ -1,7 +1,11 @@
 from pydantic import BaseModel
+from pydantic.dataclasses import dataclass
 
 
-class Price(BaseModel):
+# A slots dataclass rather than a BaseModel: thousands are built per ticker, and without a
+# per-instance __dict__ and fields-set each one takes about a tenth of the memory
+@dataclass(slots=True, frozen=True)
+class Price:
     open: float
     close: float
     high: float
@@ -16,6 +16,7 @@ from src.utils.ollama import ensure_ollama_and_model
 
 import argparse
 from datetime import datetime
+from typing import Callable
 from dateutil.relativedelta import relativedelta
 from src.utils.visualize import save_graph_as_png
 import json
@@ -51,7 +52,14 @@ def run_hedge_fund(
     selected_analysts: list[str] = [],
     model_name: str = "gpt-4o",
     model_provider: str = "OpenAI",
+    on_agent_complete: Callable[[str, dict | None], None] | None = None,
 ):
+    """
+    Run the hedge fund and return its decisions and analyst signals.
+
+    If on_agent_complete is given, the graph is streamed and the callback is called
+    with each agent's name and parsed output as soon as that agent finishes.
+    """
     # Start progress tracking
     progress.start()
 
@@ -63,27 +71,40 @@ def run_hedge_fund(
         else:
             agent = app
 
-        final_state = agent.invoke(
-            {
-                "messages": [
-                    HumanMessage(
-                        content="Make trading decisions based on the provided data.",
-                    )
-                ],
-                "data": {
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "analyst_signals": {},
-                },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
+        initial_state = {
+            "messages": [
+                HumanMessage(
+                    content="Make trading decisions based on the provided data.",
+                )
+            ],
+            "data": {
+                "tickers": tickers,
+                "portfolio": portfolio,
+                "start_date": start_date,
+                "end_date": end_date,
+                "analyst_signals": {},
+            },
+            "metadata": {
+                "show_reasoning": show_reasoning,
+                "model_name": model_name,
+                "model_provider": model_provider,
             },
-        )
+        }
+
+        if on_agent_complete is None:
+            final_state = agent.invoke(initial_state)
+        else:
+            final_state = None
+            # "updates" yields each node's output as it finishes, "values" the full state after each step
+            for mode, chunk in agent.stream(initial_state, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    final_state = chunk
+                    continue
+                for node_name, update in chunk.items():
+                    if node_name == "start_node" or not update or not update.get("messages"):
+                        continue
+                    message = update["messages"][-1]
+                    on_agent_complete(message.name or node_name, parse_hedge_fund_response(message.content))
 
         return {
             "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
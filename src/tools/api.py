@@ -1,8 +1,15 @@
 import datetime
+import functools
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import yfinance as yf
-from typing import Optional
+from curl_cffi import requests as curl_requests
+from curl_cffi.requests.exceptions import HTTPError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from typing import Callable, Optional
+from yfinance.exceptions import YFRateLimitError
 
 from src.data.cache import get_cache
 from src.data.models import (
@@ -16,50 +23,180 @@ from src.data.models import (
     LineItemResponse,
     InsiderTrade,
     InsiderTradeResponse,
+    CompanyFacts,
     CompanyFactsResponse,
 )
 
 # Global cache instance
 _cache = get_cache()
 
+# Shared HTTP session so every Yahoo Finance request reuses pooled keep-alive connections.
+# yfinance requires a curl_cffi session rather than a plain requests.Session.
+_session = curl_requests.Session(impersonate="chrome")
 
-def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or Yahoo Finance."""
+# Upper bound on concurrent Yahoo Finance requests for multi-ticker fetches
+MAX_FETCH_WORKERS = 16
+
+# Process-wide cap on in-flight Yahoo Finance requests, to stay under its rate limit
+MAX_IN_FLIGHT_REQUESTS = 8
+_request_slots = threading.Semaphore(MAX_IN_FLIGHT_REQUESTS)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Whether a Yahoo Finance error is transient: a rate limit (429) or a server error (5xx)."""
+    if isinstance(error, YFRateLimitError):
+        return True
+    if isinstance(error, HTTPError):
+        status = getattr(getattr(error, "response", None), "status_code", None)
+        return status == 429 or (status is not None and status >= 500)
+    return False
+
+
+def _rate_limited(func: Callable) -> Callable:
+    """Hold a request slot while calling Yahoo Finance and retry transient errors with jittered backoff."""
+
+    @retry(
+        stop=stop_after_attempt(5),
+        wait=wait_exponential_jitter(initial=1, max=30),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # The slot is released before backing off so waiting retries don't block other requests
+        with _request_slots:
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _fetch_many(fetch: Callable, tickers: list[str], *args, **kwargs) -> dict:
+    """Run a per-ticker fetch function concurrently and collect the results by ticker."""
+    if not tickers:
+        return {}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tickers))) as executor:
+        futures = {executor.submit(fetch, ticker, *args, **kwargs): ticker for ticker in tickers}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def _ticker(ticker: str) -> yf.Ticker:
+    """Create a yfinance Ticker bound to the shared HTTP session."""
+    return yf.Ticker(ticker, session=_session)
+
+
+@_rate_limited
+def _fetch_info(ticker: str) -> dict:
+    return _ticker(ticker).info
+
+
+@_rate_limited
+def _fetch_history(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    return _ticker(ticker).history(start=start_date, end=end_date)
+
+
+@_rate_limited
+def _fetch_news(ticker: str) -> list[dict]:
+    return _ticker(ticker).news
+
+
+def _get_info(ticker: str) -> dict:
+    """Fetch ticker info from cache or Yahoo Finance.
+
+    Financial metrics, company facts and market cap all read the same quote summary,
+    so it is fetched once and shared through the cache.
+    """
+    if (info := _cache.get_info(ticker)) is not None:
+        return info
+
+    info = _fetch_info(ticker)
+    _cache.set_info(ticker, info)
+    return info
+
+
+def _price_dicts_from_frame(df: pd.DataFrame) -> list[dict[str, any]]:
+    """Convert a yfinance OHLCV DataFrame to price dicts without per-row pandas or datetime work."""
+    # Format every date in one vectorized call and pull each column out as a numpy array once
+    times = df.index.strftime('%Y-%m-%d').to_list()
+    opens = df['Open'].to_numpy()
+    closes = df['Close'].to_numpy()
+    highs = df['High'].to_numpy()
+    lows = df['Low'].to_numpy()
+    volumes = df['Volume'].to_numpy()
+
+    # Values are cast explicitly, so the dicts can be cached as-is and turned into Price objects cheaply
+    return [
+        {'open': float(o), 'close': float(c), 'high': float(h), 'low': float(l), 'volume': int(v), 'time': t}
+        for o, c, h, l, v, t in zip(opens, closes, highs, lows, volumes, times)
+    ]
+
+
+def get_prices_raw(ticker: str, start_date: str, end_date: str) -> list[dict[str, any]]:
+    """Fetch price data as plain dicts from cache or Yahoo Finance, skipping Price model construction."""
     # Check cache first
-    if cached_data := _cache.get_prices(ticker):
-        # Filter cached data by date range and convert to Price objects
-        filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-        if filtered_data:
-            return filtered_data
+    if (cached_data := _cache.get_prices_in_range(ticker, start_date, end_date)) is not None:
+        return cached_data
 
     # If not in cache or no data in range, fetch from Yahoo Finance
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(start=start_date, end=end_date)
+        df = _fetch_history(ticker, start_date, end_date)
         
         if df.empty:
             return []
 
-        # Convert DataFrame to list of Price objects
-        prices = []
-        for index, row in df.iterrows():
-            price = Price(
-                open=float(row['Open']),
-                close=float(row['Close']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                volume=int(row['Volume']),
-                time=index.strftime('%Y-%m-%d')
-            )
-            prices.append(price)
+        price_dicts = _price_dicts_from_frame(df)
 
         # Cache the results
-        _cache.set_prices(ticker, [p.model_dump() for p in prices])
-        return prices
+        _cache.set_prices(ticker, price_dicts, start_date, end_date)
+        return price_dicts
     except Exception as e:
         raise Exception(f"Error fetching data from Yahoo Finance: {ticker} - {str(e)}")
 
 
+def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data from cache or Yahoo Finance."""
+    return [Price(**price) for price in get_prices_raw(ticker, start_date, end_date)]
+
+
+def _download_price_frames(tickers: list[str], start_date: str, end_date: str) -> dict[str, pd.DataFrame]:
+    """Fetch prices for several tickers concurrently and return one OHLCV frame per ticker that has data.
+
+    Each ticker is its own history request, so it holds its own request slot and is retried on its own.
+    """
+    if not tickers:
+        return {}
+
+    try:
+        histories = _fetch_many(_fetch_history, tickers, start_date, end_date)
+    except Exception as e:
+        raise Exception(f"Error fetching data from Yahoo Finance: {', '.join(tickers)} - {str(e)}")
+
+    frames: dict[str, pd.DataFrame] = {}
+    for ticker, df in histories.items():
+        if df is None or df.empty:
+            continue
+        ticker_df = df[["Open", "High", "Low", "Close", "Volume"]].dropna()
+        if not ticker_df.empty:
+            frames[ticker] = ticker_df
+
+    return frames
+
+
+def get_prices_batch(tickers: list[str], start_date: str, end_date: str) -> dict[str, list[Price]]:
+    """Fetch price data for several tickers concurrently and cache it for every ticker in one write."""
+    if not tickers:
+        return {}
+
+    price_dicts = {ticker: _price_dicts_from_frame(ticker_df) for ticker, ticker_df in _download_price_frames(tickers, start_date, end_date).items()}
+
+    # Cache the results for every ticker in one write
+    _cache.set_prices_many(price_dicts, start_date, end_date)
+    return {ticker: [Price(**price) for price in prices] for ticker, prices in price_dicts.items()}
+
+
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -70,14 +207,13 @@ def get_financial_metrics(
     # Check cache first
     if cached_data := _cache.get_financial_metrics(ticker):
         # Filter cached data by date and limit
-        filtered_data = [FinancialMetrics(**metric) for metric in cached_data if metric["report_period"] <= end_date]
+        filtered_data = [FinancialMetrics.model_construct(**metric) for metric in cached_data if metric["report_period"] <= end_date]
         filtered_data.sort(key=lambda x: x.report_period, reverse=True)
         if filtered_data:
             return filtered_data[:limit]
 
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
         
         # Create FinancialMetrics object from Yahoo Finance data
         metrics = FinancialMetrics(
@@ -127,12 +263,28 @@ def get_financial_metrics(
         )
 
         # Cache the results
-        _cache.set_financial_metrics(ticker, [metrics.model_dump()])
+        # The validated field dict is cached as-is rather than re-serialized with model_dump
+        _cache.set_financial_metrics(ticker, [metrics.__dict__])
         return [metrics]
     except Exception as e:
         raise Exception(f"Error fetching financial metrics from Yahoo Finance: {ticker} - {str(e)}")
 
 
+def get_financial_metrics_many(
+    tickers: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[FinancialMetrics]]:
+    """Fetch financial metrics for several tickers concurrently."""
+    return _fetch_many(get_financial_metrics, tickers, end_date, period=period, limit=limit)
+
+
+def _to_epoch_ms(date: str) -> int:
+    """Convert a YYYY-MM-DD date string to UTC epoch milliseconds."""
+    return int(datetime.datetime.fromisoformat(date).replace(tzinfo=datetime.timezone.utc).timestamp() * 1000)
+
+
 def get_company_news(
     ticker: str,
     end_date: str,
@@ -141,26 +293,25 @@ def get_company_news(
 ) -> list[CompanyNews]:
     """Fetch company news from cache or Yahoo Finance."""
     # Check cache first
-    if cached_data := _cache.get_company_news(ticker):
-        # Filter cached data by date range
-        filtered_data = [CompanyNews(**news) for news in cached_data if (start_date is None or news["date"] >= start_date) and news["date"] <= end_date]
-        filtered_data.sort(key=lambda x: x.date, reverse=True)
-        if filtered_data:
-            return filtered_data
+    if (cached_data := _cache.get_company_news_in_range(ticker, start_date, end_date)) is not None:
+        # Cached news is sorted oldest first, return newest first
+        return [CompanyNews.model_construct(**news) for news in reversed(cached_data)]
 
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news
+        news = _fetch_news(ticker)
         
         if not news:
             return []
 
+        # Compute the date bounds once as UTC epoch milliseconds
+        start_ms = _to_epoch_ms(start_date) if start_date else 0
+        end_ms = _to_epoch_ms(end_date)
+
         # Convert news to CompanyNews objects
         company_news = []
         for item in news:
-            if start_date and item.get('providerPublishTime', 0) < pd.Timestamp(start_date).timestamp() * 1000:
-                continue
-            if item.get('providerPublishTime', 0) > pd.Timestamp(end_date).timestamp() * 1000:
+            publish_time = item.get('providerPublishTime', 0)
+            if publish_time < start_ms or publish_time > end_ms:
                 continue
                 
             news_item = CompanyNews(
@@ -168,7 +319,7 @@ def get_company_news(
                 title=item.get('title', ''),
                 author=item.get('publisher', ''),
                 source=item.get('publisher', ''),
-                date=pd.Timestamp(item.get('providerPublishTime', 0), unit='ms').strftime('%Y-%m-%d'),
+                date=datetime.datetime.fromtimestamp(publish_time / 1000, tz=datetime.timezone.utc).strftime('%Y-%m-%d'),
                 url=item.get('link', ''),
                 sentiment=None  # Yahoo Finance doesn't provide sentiment
             )
@@ -178,17 +329,26 @@ def get_company_news(
                 break
 
         # Cache the results
-        _cache.set_company_news(ticker, [news.model_dump() for news in company_news])
+        _cache.set_company_news(ticker, [news.__dict__ for news in company_news], start_date, end_date)
         return company_news
     except Exception as e:
         raise Exception(f"Error fetching news from Yahoo Finance: {ticker} - {str(e)}")
 
 
+def get_company_news_many(
+    tickers: list[str],
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+) -> dict[str, list[CompanyNews]]:
+    """Fetch company news for several tickers concurrently."""
+    return _fetch_many(get_company_news, tickers, end_date, start_date=start_date, limit=limit)
+
+
 def get_company_facts(ticker: str) -> CompanyFactsResponse:
     """Fetch company facts from Yahoo Finance."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
         
         facts = CompanyFacts(
             ticker=ticker,
@@ -243,22 +403,56 @@ def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     if not prices:
         return pd.DataFrame()
     
-    data = {
-        'open': [p.open for p in prices],
-        'high': [p.high for p in prices],
-        'low': [p.low for p in prices],
-        'close': [p.close for p in prices],
-        'volume': [p.volume for p in prices]
-    }
-    
-    df = pd.DataFrame(data, index=pd.to_datetime([p.time for p in prices]))
-    return df
+    # Price has slots and no __dict__, so read its fields directly
+    return _price_records_to_df([{"open": p.open, "close": p.close, "high": p.high, "low": p.low, "volume": p.volume, "time": p.time} for p in prices])
+
+
+def _price_records_to_df(records: list[dict[str, any]]) -> pd.DataFrame:
+    """Convert price dicts to a DataFrame indexed by date in a single pass."""
+    if not records:
+        return pd.DataFrame()
+
+    df = pd.DataFrame.from_records(records)
+    df.index = pd.to_datetime(df.pop("time").to_numpy())
+    return df[["open", "high", "low", "close", "volume"]]
 
 
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
     """Get price data as DataFrame."""
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    if (df := _cache.get_price_frame(ticker, start_date, end_date)) is not None:
+        return df
+
+    df = _price_records_to_df(get_prices_raw(ticker, start_date, end_date))
+    if not df.empty:
+        _cache.set_price_frame(ticker, start_date, end_date, df)
+    return df
+
+
+def get_price_data_many(tickers: list[str], start_date: str, end_date: str) -> dict[str, pd.DataFrame]:
+    """Get price data for several tickers as DataFrames, fetching only the tickers not already cached, concurrently."""
+    frames: dict[str, pd.DataFrame] = {}
+    price_rows: dict[str, list[dict[str, any]]] = {}
+    missing = []
+    for ticker in tickers:
+        if (df := _cache.get_price_frame(ticker, start_date, end_date)) is not None:
+            frames[ticker] = df
+        elif (cached_rows := _cache.get_prices_in_range(ticker, start_date, end_date)) is not None:
+            price_rows[ticker] = cached_rows
+        else:
+            missing.append(ticker)
+
+    fetched = {ticker: _price_dicts_from_frame(ticker_df) for ticker, ticker_df in _download_price_frames(missing, start_date, end_date).items()}
+    # Cache the fetched rows in one write, so get_prices for these tickers is served from the cache
+    if fetched:
+        _cache.set_prices_many(fetched, start_date, end_date)
+    price_rows.update(fetched)
+
+    for ticker, rows in price_rows.items():
+        df = _price_records_to_df(rows)
+        if not df.empty:
+            _cache.set_price_frame(ticker, start_date, end_date, df)
+            frames[ticker] = df
+    return frames
 
 
 def get_market_cap(
@@ -267,9 +461,16 @@ def get_market_cap(
 ) -> float | None:
     """Fetch market cap from Yahoo Finance."""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _get_info(ticker)
         return info.get('marketCap')
     except Exception as e:
         print(f"Error fetching market cap from Yahoo Finance: {ticker} - {str(e)}")
         return None
+
+
+def get_market_caps(
+    tickers: list[str],
+    end_date: str,
+) -> dict[str, float | None]:
+    """Fetch market caps for several tickers concurrently."""
+    return _fetch_many(get_market_cap, tickers, end_date)
@@ -0,0 +1,178 @@
+import time
+
+import pandas as pd
+import pytest
+from curl_cffi.requests.exceptions import HTTPError
+from yfinance.exceptions import YFRateLimitError
+
+from src.data import cache as cache_module
+from src.data.cache import SqliteCache
+from src.tools import api
+
+
+def _history(days: list[str], closes: list[float]) -> pd.DataFrame:
+    """A frame shaped like yf.Ticker.history() output."""
+    return pd.DataFrame(
+        {"Open": closes, "High": closes, "Low": closes, "Close": closes, "Volume": [1000] * len(closes), "Dividends": [0.0] * len(closes)},
+        index=pd.DatetimeIndex(days, tz="America/New_York", name="Date"),
+    )
+
+
+@pytest.fixture
+def cache(monkeypatch) -> SqliteCache:
+    cache = SqliteCache(":memory:")
+    monkeypatch.setattr(api, "_cache", cache)
+    return cache
+
+
+class FakeHistory:
+    """Stands in for _fetch_history, serving a frame per ticker and recording which tickers were fetched."""
+
+    def __init__(self):
+        self.frames: dict[str, pd.DataFrame] = {}
+        self.calls: list[str] = []
+
+    def __call__(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        self.calls.append(ticker)
+        return self.frames.get(ticker, pd.DataFrame())
+
+
+@pytest.fixture
+def history(monkeypatch) -> FakeHistory:
+    fake = FakeHistory()
+    monkeypatch.setattr(api, "_fetch_history", fake)
+    return fake
+
+
+def test_get_price_data_refetches_a_live_range_after_it_expires(cache, history, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    today = time.strftime("%Y-%m-%d", time.gmtime(now[0]))
+    yesterday = time.strftime("%Y-%m-%d", time.gmtime(now[0] - 24 * 60 * 60))
+
+    history.frames["AAPL"] = _history([yesterday, today], [1.0, 3.0])
+    assert api.get_price_data("AAPL", yesterday, today)["close"].to_list() == [1.0, 3.0]
+
+    history.frames["AAPL"] = _history([yesterday, today], [1.0, 4.0])
+    now[0] += cache_module.LIVE_PRICES_TTL_SECONDS + 1
+    assert api.get_price_data("AAPL", yesterday, today)["close"].to_list() == [1.0, 4.0]
+    assert [p.close for p in api.get_prices("AAPL", yesterday, today)] == [1.0, 4.0]
+
+
+def test_get_price_data_many_reads_covered_tickers_from_the_cache(cache, history):
+    cache.set_prices("AAPL", [{"open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0, "volume": 1000, "time": "2024-01-02"}], "2024-01-01", "2024-01-05")
+    history.frames["MSFT"] = _history(["2024-01-02", "2024-01-03"], [2.0, 3.0])
+
+    frames = api.get_price_data_many(["AAPL", "MSFT"], "2024-01-01", "2024-01-05")
+
+    assert history.calls == ["MSFT"]
+    assert frames["AAPL"]["close"].to_list() == [1.0]
+    assert frames["MSFT"]["close"].to_list() == [2.0, 3.0]
+    # Same layout as get_price_data
+    assert list(frames["MSFT"].columns) == ["open", "high", "low", "close", "volume"]
+    assert frames["MSFT"].index.equals(pd.to_datetime(pd.Index(["2024-01-02", "2024-01-03"])))
+
+
+def test_prices_to_df_matches_get_price_data(cache, history):
+    history.frames["AAPL"] = _history(["2024-01-02", "2024-01-03"], [2.0, 3.0])
+
+    prices = api.get_prices("AAPL", "2024-01-01", "2024-01-05")
+
+    assert [(p.time, p.close, p.volume) for p in prices] == [("2024-01-02", 2.0, 1000), ("2024-01-03", 3.0, 1000)]
+    pd.testing.assert_frame_equal(api.prices_to_df(prices), api.get_price_data("AAPL", "2024-01-01", "2024-01-05"))
+
+
+def test_download_price_frames_returns_one_clean_frame_per_ticker(history):
+    history.frames["AAPL"] = _history(["2024-01-02", "2024-01-03"], [2.0, 3.0])
+    history.frames["MSFT"] = _history(["2024-01-02", "2024-01-03"], [4.0, float("nan")])
+
+    frames = api._download_price_frames(["AAPL", "MSFT", "MISSING"], "2024-01-01", "2024-01-05")
+
+    # Tickers with no data are left out, and incomplete rows are dropped
+    assert sorted(frames) == ["AAPL", "MSFT"]
+    assert sorted(history.calls) == ["AAPL", "MISSING", "MSFT"]
+    assert list(frames["AAPL"].columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert frames["AAPL"]["Close"].to_list() == [2.0, 3.0]
+    assert frames["MSFT"]["Close"].to_list() == [4.0]
+
+
+def test_download_price_frames_reports_failed_tickers(monkeypatch):
+    def fetch_history(ticker, start_date, end_date):
+        raise ValueError("boom")
+
+    monkeypatch.setattr(api, "_fetch_history", fetch_history)
+
+    with pytest.raises(Exception, match="Error fetching data from Yahoo Finance: AAPL - boom"):
+        api._download_price_frames(["AAPL"], "2024-01-01", "2024-01-05")
+
+
+def test_get_prices_batch_caches_every_ticker(cache, history):
+    history.frames["AAPL"] = _history(["2024-01-02"], [2.0])
+    history.frames["MSFT"] = _history(["2024-01-02"], [4.0])
+
+    prices = api.get_prices_batch(["AAPL", "MSFT"], "2024-01-01", "2024-01-05")
+
+    assert {ticker: [p.close for p in ticker_prices] for ticker, ticker_prices in prices.items()} == {"AAPL": [2.0], "MSFT": [4.0]}
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", "2024-01-05") == [{"open": 2.0, "close": 2.0, "high": 2.0, "low": 2.0, "volume": 1000, "time": "2024-01-02"}]
+    assert cache.get_prices_in_range("MSFT", "2024-01-01", "2024-01-05") is not None
+
+
+class _Response:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize("status_code, retryable", [(429, True), (500, True), (503, True), (400, False), (401, False), (404, False)])
+def test_is_retryable_only_for_rate_limits_and_server_errors(status_code, retryable):
+    assert api._is_retryable(HTTPError("error", response=_Response(status_code))) is retryable
+
+
+def test_is_retryable_for_yfinance_rate_limits_only():
+    assert api._is_retryable(YFRateLimitError())
+    assert not api._is_retryable(HTTPError("no response"))
+    assert not api._is_retryable(ValueError("bad data"))
+
+
+def _flaky(errors: list[Exception]):
+    """A rate-limited function that raises the given errors in turn, then succeeds, with backoff disabled."""
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    wrapped = api._rate_limited(fetch)
+    wrapped.retry.sleep = lambda seconds: None
+    return wrapped, calls
+
+
+def test_rate_limited_retries_transient_errors():
+    fetch, calls = _flaky([HTTPError("busy", response=_Response(429)), HTTPError("down", response=_Response(503))])
+
+    assert fetch() == "ok"
+    assert len(calls) == 3
+
+
+def test_rate_limited_fails_fast_on_client_errors():
+    fetch, calls = _flaky([HTTPError("not found", response=_Response(404))])
+
+    with pytest.raises(HTTPError):
+        fetch()
+    assert len(calls) == 1
+
+
+def test_to_epoch_ms_is_utc_midnight():
+    assert api._to_epoch_ms("2024-01-02") == 1704153600000
+    assert api._to_epoch_ms("2024-01-02") == pd.Timestamp("2024-01-02", tz="UTC").value // 1_000_000
+
+
+def test_get_company_news_filters_on_utc_date_bounds(cache, monkeypatch):
+    start_ms, end_ms = api._to_epoch_ms("2024-01-02"), api._to_epoch_ms("2024-01-05")
+    published = {"before": start_ms - 1, "at start": start_ms, "late on day 3": api._to_epoch_ms("2024-01-03") + 23 * 60 * 60 * 1000, "at end": end_ms, "after": end_ms + 1}
+    monkeypatch.setattr(api, "_fetch_news", lambda ticker: [{"title": title, "providerPublishTime": ms, "publisher": "Reuters", "link": ""} for title, ms in published.items()])
+
+    news = api.get_company_news("AAPL", "2024-01-05", start_date="2024-01-02")
+
+    assert sorted((item.title, item.date) for item in news) == [("at end", "2024-01-05"), ("at start", "2024-01-02"), ("late on day 3", "2024-01-03")]
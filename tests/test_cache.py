@@ -0,0 +1,174 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.data import cache as cache_module
+from src.data.cache import SqliteCache
+
+
+def _price(day: str, close: float = 100.0) -> dict:
+    return {"open": close - 1, "close": close, "high": close + 1, "low": close - 2, "volume": 1000, "time": day}
+
+
+def _news(day: str, title: str) -> dict:
+    return {"ticker": "AAPL", "title": title, "author": "Reuters", "source": "Reuters", "date": day, "url": f"https://example.com/{title}", "sentiment": None}
+
+
+@pytest.fixture
+def cache() -> SqliteCache:
+    return SqliteCache(":memory:")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze time.time() in the cache module and let tests move it forward."""
+    now = [time.time()]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_prices_in_range_reads_back_a_fetched_range(cache):
+    prices = [_price("2024-01-02"), _price("2024-01-03", 101.0), _price("2024-01-04", 102.0)]
+    cache.set_prices("AAPL", prices, "2024-01-01", "2024-01-05")
+
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", "2024-01-05") == prices
+    assert cache.get_prices_in_range("AAPL", "2024-01-03", "2024-01-03") == [prices[1]]
+    assert cache.get_prices("AAPL") == prices
+
+
+def test_prices_in_range_misses_outside_the_fetched_range(cache):
+    cache.set_prices("AAPL", [_price("2024-01-02")], "2024-01-01", "2024-01-05")
+
+    # Overlapping rows alone are not a hit; the whole range must have been fetched
+    assert cache.get_prices_in_range("AAPL", "2023-12-01", "2024-01-05") is None
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", "2024-02-01") is None
+    assert cache.get_prices_in_range("MSFT", "2024-01-01", "2024-01-05") is None
+
+
+def test_prices_in_range_returns_empty_list_for_covered_range_without_rows(cache):
+    cache.set_prices("AAPL", [_price("2024-01-02")], "2024-01-01", "2024-01-31")
+
+    assert cache.get_prices_in_range("AAPL", "2024-01-10", "2024-01-20") == []
+
+
+def test_set_prices_many_writes_every_ticker(cache):
+    cache.set_prices_many({"AAPL": [_price("2024-01-02")], "MSFT": [_price("2024-01-02", 300.0), _price("2024-01-03", 301.0)]}, "2024-01-01", "2024-01-05")
+
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", "2024-01-05") == [_price("2024-01-02")]
+    assert cache.get_prices_in_range("MSFT", "2024-01-01", "2024-01-05") == [_price("2024-01-02", 300.0), _price("2024-01-03", 301.0)]
+
+
+def test_set_prices_replaces_rows_for_the_same_day(cache):
+    cache.set_prices("AAPL", [_price("2024-01-02", 100.0)], "2024-01-01", "2024-01-05")
+    cache.set_prices("AAPL", [_price("2024-01-02", 105.0)], "2024-01-01", "2024-01-05")
+
+    assert cache.get_prices("AAPL") == [_price("2024-01-02", 105.0)]
+
+
+def test_live_price_range_expires(cache, clock):
+    today = time.strftime("%Y-%m-%d", time.gmtime(clock[0]))
+    cache.set_prices("AAPL", [_price(today)], "2024-01-01", today)
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", today) is not None
+
+    clock[0] += cache_module.LIVE_PRICES_TTL_SECONDS + 1
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", today) is None
+
+
+def test_settled_price_range_does_not_expire(cache, clock):
+    cache.set_prices("AAPL", [_price("2024-01-02")], "2024-01-01", "2024-01-05")
+
+    clock[0] += 365 * 24 * 60 * 60
+    assert cache.get_prices_in_range("AAPL", "2024-01-01", "2024-01-05") == [_price("2024-01-02")]
+
+
+def test_news_on_the_same_date_are_all_kept(cache):
+    news = [_news("2024-01-02", "first"), _news("2024-01-02", "second"), _news("2024-01-03", "third")]
+    cache.set_company_news("AAPL", news, "2024-01-01", "2024-01-05")
+
+    cached = cache.get_company_news_in_range("AAPL", "2024-01-01", "2024-01-05")
+    assert len(cached) == 3
+    assert {item["title"] for item in cached} == {"first", "second", "third"}
+    assert [item["date"] for item in cached] == ["2024-01-02", "2024-01-02", "2024-01-03"]
+
+
+def test_refetched_news_is_not_duplicated(cache):
+    news = [_news("2024-01-02", "first")]
+    cache.set_company_news("AAPL", news, "2024-01-01", "2024-01-05")
+    cache.set_company_news("AAPL", news, "2024-01-01", "2024-01-05")
+
+    assert cache.get_company_news_in_range("AAPL", "2024-01-01", "2024-01-05") == news
+
+
+def test_news_without_start_date_covers_everything_up_to_end(cache):
+    cache.set_company_news("AAPL", [_news("2024-01-02", "first")], None, "2024-01-05")
+
+    assert cache.get_company_news_in_range("AAPL", None, "2024-01-05") == [_news("2024-01-02", "first")]
+    assert cache.get_company_news_in_range("AAPL", "2024-01-03", "2024-01-04") == []
+    assert cache.get_company_news_in_range("AAPL", None, "2024-01-06") is None
+
+
+def test_news_expires_after_ttl(cache, clock):
+    cache.set_company_news("AAPL", [_news("2024-01-02", "first")], "2024-01-01", "2024-01-05")
+    assert cache.get_company_news_in_range("AAPL", "2024-01-01", "2024-01-05") is not None
+
+    clock[0] += cache_module.NEWS_TTL_SECONDS + 1
+    assert cache.get_company_news_in_range("AAPL", "2024-01-01", "2024-01-05") is None
+    assert cache.get_company_news("AAPL") is None
+
+
+def test_insider_trades_on_the_same_filing_date_are_all_kept(cache):
+    trades = [{"ticker": "AAPL", "filing_date": "2024-01-02", "name": name} for name in ("a", "b")]
+    cache.set_insider_trades("AAPL", trades)
+
+    assert len(cache.get_insider_trades("AAPL")) == 2
+
+
+def test_financial_metrics_expire_after_ttl(cache, clock):
+    cache.set_financial_metrics("AAPL", [{"ticker": "AAPL", "report_period": "2024-01-05", "market_cap": 1.0}])
+    cache.set_financial_metrics("AAPL", [{"ticker": "AAPL", "report_period": "2024-01-05", "market_cap": 2.0}])
+    assert cache.get_financial_metrics("AAPL") == [{"ticker": "AAPL", "report_period": "2024-01-05", "market_cap": 2.0}]
+
+    clock[0] += cache_module.FUNDAMENTALS_TTL_SECONDS + 1
+    assert cache.get_financial_metrics("AAPL") is None
+
+
+def test_info_expires_after_ttl(cache, clock):
+    cache.set_info("AAPL", {"marketCap": 1.0})
+    assert cache.get_info("AAPL") == {"marketCap": 1.0}
+
+    clock[0] += cache_module.INFO_TTL_SECONDS + 1
+    assert cache.get_info("AAPL") is None
+
+
+def test_outdated_schema_is_rebuilt(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SqliteCache(path).set_prices("AAPL", [_price("2024-01-02")], "2024-01-01", "2024-01-05")
+
+    with cache_module.sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA user_version = 1")
+
+    assert SqliteCache(path).get_prices("AAPL") is None
+
+
+def test_price_frame_is_isolated_from_callers(cache):
+    df = pd.DataFrame({"close": [100.0, 101.0]}, index=pd.to_datetime(["2024-01-02", "2024-01-03"]))
+    cache.set_prices("AAPL", [_price("2024-01-02"), _price("2024-01-03", 101.0)], "2024-01-01", "2024-01-05")
+    cache.set_price_frame("AAPL", "2024-01-01", "2024-01-05", df)
+
+    # Neither the frame that was stored nor one that was read back shares data with the cache
+    df.loc[df.index[0], "close"] = 0.0
+    cached = cache.get_price_frame("AAPL", "2024-01-01", "2024-01-05")
+    cached.loc[cached.index[1], "close"] = 0.0
+
+    assert cache.get_price_frame("AAPL", "2024-01-01", "2024-01-05")["close"].to_list() == [100.0, 101.0]
+
+
+def test_price_frame_is_not_served_once_its_range_expires(cache, clock):
+    today = time.strftime("%Y-%m-%d", time.gmtime(clock[0]))
+    cache.set_prices("AAPL", [_price(today)], "2024-01-01", today)
+    cache.set_price_frame("AAPL", "2024-01-01", today, pd.DataFrame({"close": [100.0]}, index=pd.to_datetime([today])))
+    assert cache.get_price_frame("AAPL", "2024-01-01", today) is not None
+
+    clock[0] += cache_module.LIVE_PRICES_TTL_SECONDS + 1
+    assert cache.get_price_frame("AAPL", "2024-01-01", today) is None